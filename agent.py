@@ -7,6 +7,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+import aiohttp
 from dotenv import load_dotenv
 from livekit import rtc, api
 from livekit.agents import (
@@ -20,6 +28,11 @@ from livekit.protocol import sip as proto_sip
 from livekit.agents.multimodal import MultimodalAgent
 from livekit.plugins import openai
 
+try:
+    import uvloop
+except ImportError:  # uvloop is only installed on non-Windows platforms before Python 3.12
+    uvloop = None
+
 
 # Initialize environment variables
 # The .env.local file should look like:
@@ -30,11 +43,170 @@ from livekit.plugins import openai
 #   LIVEKIT_URL=wss://your-url-goes-here.livekit.cloud
 #   LIVEKIT_API_KEY=your-key-here
 #   LIVEKIT_API_SECRET=your-secret-here
+#   NUM_IDLE_PROCESSES=3  (optional)
 load_dotenv(dotenv_path=".env.local")
 
 # Initialize logging
 logger = logging.getLogger("phone-assistant")
-logger.setLevel(logging.INFO)
+# Default to INFO, but leave the level alone if the deployment has already configured one
+if logger.level == logging.NOTSET:
+    logger.setLevel(logging.INFO)
+
+# Use uvloop's faster event loop when it's installed. The worker and its job processes create their own
+# event loops, so the only way in is the event loop policy, set at import time so that the job processes,
+# which re-import this module, pick it up too. uvloop.install() is deprecated from Python 3.12 (and event
+# loop policies from 3.14), so on those versions we stay on the default asyncio loop.
+if uvloop is not None and sys.version_info < (3, 12):
+    uvloop.install()
+
+# Tasks we spawn from event handlers start eagerly on Python 3.12+, running synchronously up to their first
+# real await instead of waiting for the next loop iteration. This is only used for our own tasks, not
+# installed on the loop: SDK code such as RealtimeSession.__init__ creates tasks before it has finished
+# setting itself up, and those must not start running early.
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+# Prefix that tells the model to speak a message aloud rather than answer it in text
+SAY_PREFIX = "Using your voice to respond, please say: "
+
+# How long the transfer destination may ring. The transfer RPC stays open while it rings, so we only give
+# up on it (and apologize to the caller) once the ring window plus a margin has passed.
+TRANSFER_RINGING_TIMEOUT = 30
+TRANSFER_RPC_TIMEOUT = TRANSFER_RINGING_TIMEOUT + 5.0
+# The transfer is sent once the hold prompt starts playing. If it hasn't started within this many seconds
+# (e.g. the realtime session is slow to respond), we send it anyway rather than leave the caller waiting.
+TRANSFER_PROMPT_START_TIMEOUT = 6.0
+
+# End the call if the caller hasn't spoken or pressed a key for this many seconds. The idle check runs every
+# IDLE_POLL_INTERVAL seconds, and the caller is asked if they're still there before we hang up.
+IDLE_TIMEOUT = 600.0
+IDLE_POLL_INTERVAL = 30.0
+
+# Department mapping: DTMF digit -> (env var holding the transfer number, department name)
+DEPARTMENTS = {
+    "1": ("BILLING_PHONE_NUMBER", "Billing"),
+    "2": ("TECH_SUPPORT_PHONE_NUMBER", "Tech Support"),
+    "3": ("CUSTOMER_SERVICE_PHONE_NUMBER", "Customer Service")
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Configuration read from the environment once at startup, so nothing on the call path touches os.environ.
+    """
+    livekit_url: str
+    api_key: str
+    api_secret: str = field(repr=False)
+    # Department transfer numbers, keyed on the env var they were read from (see DEPARTMENTS)
+    dept_numbers: Mapping[str, str]
+    # None leaves it to the LiveKit agents default
+    num_idle_processes: int | None
+
+    @classmethod
+    def from_env(cls) -> Config:
+        """
+        Build the configuration from the environment.
+
+        Returns:
+            Config: The configuration.
+
+        Raises:
+            RuntimeError: If any of the LiveKit connection settings are missing.
+        """
+        required = ("LIVEKIT_URL", "LIVEKIT_API_KEY", "LIVEKIT_API_SECRET")
+        missing = [name for name in required if not os.getenv(name)]
+        if missing:
+            raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
+
+        dept_numbers = {}
+        for env_var, dept_name in DEPARTMENTS.values():
+            number = os.getenv(env_var)
+            if number:
+                dept_numbers[env_var] = number
+            else:
+                logger.warning("%s is not set, transfers to %s are disabled", env_var, dept_name)
+
+        num_idle_processes = os.getenv("NUM_IDLE_PROCESSES")
+
+        return cls(
+            livekit_url=os.environ["LIVEKIT_URL"],
+            api_key=os.environ["LIVEKIT_API_KEY"],
+            api_secret=os.environ["LIVEKIT_API_SECRET"],
+            dept_numbers=MappingProxyType(dept_numbers),
+            num_idle_processes=int(num_idle_processes) if num_idle_processes else None,
+        )
+
+
+CFG = Config.from_env()
+
+# Resolved once at startup and indexed by digit value ('0'..'9' -> 0..9), so handling a keypress is a
+# single tuple index. Each slot is (transfer number, department name), or None for a digit that is unmapped
+# or whose department has no number configured, so the caller is asked to choose again straight away.
+_DEPT_TUPLE = tuple(
+    (f"tel:{CFG.dept_numbers[DEPARTMENTS[digit][0]]}", DEPARTMENTS[digit][1])
+    if digit in DEPARTMENTS and DEPARTMENTS[digit][0] in CFG.dept_numbers else None
+    for digit in "0123456789"
+)
+
+# Greeting with menu options. This is the first thing the assistant says to the user.
+# You don't need to have a greeting, but it's a good idea to have one if calls are incoming.
+GREETING = (
+    "Hi, thanks for calling Vandelay Industries — global leader in fine latex goods!"
+    "You can press 1 for Billing, 2 for Technical Support, "
+    "or 3 for Customer Service. You can also just talk to me, since I'm a LiveKit agent."
+)
+
+# Everything the assistant says on its own is known up front, so the full prompts are built once here
+GREETING_PROMPT = SAY_PREFIX + GREETING
+APOLOGY_PROMPT = SAY_PREFIX + "I'm sorry, I couldn't transfer your call. Is there something else I can help with?"
+IDLE_CHECK_PROMPT = SAY_PREFIX + "Are you still there?"
+REJECT_PROMPT = SAY_PREFIX + "I'm sorry, please choose one of the options I mentioned earlier."
+TRANSFER_PROMPTS = {
+    dept_name: SAY_PREFIX + f"Transferring you to our {dept_name} department in a moment. Please hold."
+    for _, dept_name in DEPARTMENTS.values()
+}
+
+
+def build_realtime_model() -> openai.realtime.RealtimeModel:
+    """
+    Build the OpenAI realtime model used by the assistant.
+
+    Returns:
+        openai.realtime.RealtimeModel: A new realtime model.
+    """
+    return openai.realtime.RealtimeModel(
+        instructions=(
+            "You are a friendly assistant providing support. "
+            "Please inform users they can:\n"
+            "- Press 1 for Billing\n"
+            "- Press 2 for Technical Support\n"
+            "- Press 3 for Customer Service"
+        ),
+        # We use Audio for voice, and text to feed the model context behind the scenes.
+        # Whenever we use text, it's important to make sure the model knows it's supposed 
+        # to respond with voice. We do this with prompt engineering throughout the agent.
+        modalities=["audio", "text"],
+        voice="sage"
+    )
+
+
+class CallEnded(Exception):
+    """
+    Raised by a call watcher to tear down the rest of the call.
+    """
+
+
+async def end_call_when(awaitable, reason: str) -> None:
+    """
+    Wait for something that means the call is over, then raise CallEnded so the surrounding task group
+    cancels every other watcher.
+
+    Args:
+        awaitable: Completes when the call should end.
+        reason (str): Why the call ended, for logging.
+    """
+    await awaitable
+    raise CallEnded(reason)
 
 
 class PhoneAssistant:
@@ -54,6 +226,10 @@ class PhoneAssistant:
         self.assistant = None
         self.model = None
         self.livekit_api = None
+        self._http_session = None
+        self._session = None
+        self._last_activity = time.monotonic()
+        self._tasks: set[asyncio.Task] = set()
 
     async def say(self, message: str) -> None:
         """
@@ -64,16 +240,151 @@ class PhoneAssistant:
         Args:
             message (str): The message to say.
         """
-        if self.model and hasattr(self.model, 'sessions'):
-            session = self.model.sessions[0]
-            session.conversation.item.create(
-                llm.ChatMessage(
-                    role="assistant",
-                    content=f"Using your voice to respond, please say: {message}"
-                )
+        await self._say_prebuilt(SAY_PREFIX + message)
+
+    async def _say_prebuilt(self, prompt: str, metadata: dict[str, str] | None = None) -> None:
+        """
+        Ask the assistant to speak a prompt that already includes SAY_PREFIX, such as one of the prompts
+        built at import time.
+
+        Args:
+            prompt (str): The full prompt to send to the model.
+            metadata (dict[str, str] | None): Metadata to tag the response with.
+        """
+        session = self._session
+        if session is None:
+            return
+        session.conversation.item.create(
+            llm.ChatMessage(
+                role="assistant",
+                content=prompt
             )
-            session.response.create()
-            logger.debug(f"Asked assistant to say: {message}")
+        )
+        session.response.create(metadata=metadata)
+        logger.debug("Asked assistant to say: %s", prompt)
+
+    async def _say_until_playing(self, prompt: str, timeout: float) -> None:
+        """
+        Ask the assistant to speak a prebuilt prompt, and return once it has started playing to the caller
+        or `timeout` seconds have passed. The agent only reports that playout started, not which response
+        it belongs to, so we tag our response, wait for its content to arrive (which hands it to the player,
+        stopping whatever was playing before), and take the next start of playout as ours. A response that
+        ends without producing any content, e.g. because it was cancelled, never plays, so we return then.
+
+        Args:
+            prompt (str): The full prompt to send to the model.
+            timeout (float): The longest to wait for the prompt to start playing.
+        """
+        session = self._session
+        if session is None:
+            return
+
+        say_id = uuid.uuid4().hex
+        started = asyncio.Event()
+        state = {"response_id": None, "queued": False}
+
+        def on_response_created(response) -> None:
+            if state["response_id"] is None and (response.metadata or {}).get("say_id") == say_id:
+                state["response_id"] = response.id
+
+        def on_content_added(content) -> None:
+            if content.response_id == state["response_id"]:
+                state["queued"] = True
+
+        def on_response_done(response) -> None:
+            if response.id == state["response_id"] and not state["queued"]:
+                started.set()
+
+        def on_started_speaking(*args) -> None:
+            if state["queued"]:
+                started.set()
+
+        listeners = (
+            (session, "response_created", on_response_created),
+            (session, "response_content_added", on_content_added),
+            (session, "response_done", on_response_done),
+            (self.assistant, "agent_started_speaking", on_started_speaking),
+        )
+        for emitter, event, callback in listeners:
+            emitter.on(event, callback)
+        try:
+            await self._say_prebuilt(prompt, metadata={"say_id": say_id})
+            await asyncio.wait_for(started.wait(), timeout=timeout)
+        except TimeoutError:
+            logger.warning("Prompt didn't start playing within %.0f seconds, carrying on", timeout)
+        finally:
+            for emitter, event, callback in listeners:
+                emitter.off(event, callback)
+
+    def touch(self, *args) -> None:
+        """
+        Record activity from the caller, pushing back the idle timeout.
+        """
+        self._last_activity = time.monotonic()
+
+    async def wait_for_idle(self, timeout: float) -> None:
+        """
+        Wait until the caller has been inactive for the given number of seconds and then doesn't respond
+        to an "Are you still there?" check.
+
+        Args:
+            timeout (float): How long the caller may go without activity.
+        """
+        while True:
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+            if time.monotonic() - self._last_activity < timeout:
+                continue
+
+            # Give the caller one chance to speak up before we hang up on them
+            checked_at = time.monotonic()
+            await self._say_prebuilt(IDLE_CHECK_PROMPT)
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+            if self._last_activity < checked_at:
+                return
+
+    async def wait_for_model_failure(self) -> None:
+        """
+        Wait until the realtime session's connection to OpenAI ends, e.g. because the WebSocket was dropped.
+        The SDK doesn't emit an event for this, so we watch the session's main task.
+        """
+        if self._session is None:
+            return
+        main_task = getattr(self._session, "_main_atask", None)
+        if not isinstance(main_task, asyncio.Task):
+            # Private SDK detail; if it changes, fall back to ending the call on the other watchers only
+            logger.warning("Can't watch the realtime session's connection, model failures won't end the call")
+            await asyncio.Event().wait()
+        # asyncio.wait() rather than awaiting the task, so cancelling the watcher doesn't cancel the session
+        await asyncio.wait({main_task})
+
+    def open_livekit_api(self) -> None:
+        """
+        Create the LiveKit API client for this call and warm up its connection in the background, so the
+        TCP + TLS handshake is already done by the time the caller asks to be transferred.
+        """
+        logger.debug("Initializing LiveKit API client with URL: %s", CFG.livekit_url)
+        # Idle connections are closed by the connector after keepalive_timeout, so a stale one is never reused
+        self._http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=300),
+            # Matches LiveKitAPI's own default of 10 seconds for the sessions it creates itself
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        self.livekit_api = api.LiveKitAPI(
+            url=CFG.livekit_url,
+            api_key=CFG.api_key,
+            api_secret=CFG.api_secret,
+            session=self._http_session
+        )
+        self._spawn(self._warm_livekit_api())
+
+    async def _warm_livekit_api(self) -> None:
+        """
+        Make a cheap request on the LiveKit API client so it opens its connection ahead of time.
+        """
+        try:
+            await self.livekit_api.room.list_rooms(api.ListRoomsRequest(names=[self.context.job.room.name]))
+        except Exception:
+            logger.warning("Failed to warm up the LiveKit API connection", exc_info=True)
 
     async def connect_to_room(self) -> rtc.Participant:
         """
@@ -83,7 +394,7 @@ class PhoneAssistant:
             rtc.Participant: The connected participant.
         """
         room_name = self.context.room.name
-        logger.info(f"Connecting to room: {room_name}")
+        logger.info("Connecting to room: %s", room_name)
         await self.context.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
         self._setup_event_handlers(self.context.room)
         participant = await self.context.wait_for_participant()
@@ -98,6 +409,8 @@ class PhoneAssistant:
             room (rtc.Room): The LiveKit room instance.
         """
 
+        # Room.on() only accepts synchronous callbacks, so the handler spawns the async work itself. On Python 3.12+
+        # _spawn starts that work inline, right here; on older versions it starts on the next loop iteration.
         @room.on("sip_dtmf_received")
         def handle_dtmf(dtmf_event: rtc.SipDTMF):
             """
@@ -110,21 +423,36 @@ class PhoneAssistant:
             code = dtmf_event.code
             digit = dtmf_event.digit
             identity = dtmf_event.participant.identity
-            logger.info(f"DTMF received - Code: {code}, Digit: '{digit}'")
-
-            # Define department mapping
-            department_numbers = {
-                "1": ("BILLING_PHONE_NUMBER", "Billing"),
-                "2": ("TECH_SUPPORT_PHONE_NUMBER", "Tech Support"),
-                "3": ("CUSTOMER_SERVICE_PHONE_NUMBER", "Customer Service")
-            }
-            logger.info(f"Department numbers: {department_numbers}")
-            if digit in department_numbers:
-                env_var, dept_name = department_numbers[digit]
-                transfer_number = f"tel:{os.getenv(env_var)}"
-                asyncio.create_task(self._handle_transfer(identity, transfer_number, dept_name))
+            self.touch()
+            logger.info("DTMF received - Code: %s, Digit: '%s'", code, digit)
+
+            # '*', '#' and anything else outside '0'..'9' fall outside the table
+            idx = ord(digit) - 48 if len(digit) == 1 else -1
+            entry = _DEPT_TUPLE[idx] if 0 <= idx < 10 else None
+            if entry is not None:
+                transfer_number, dept_name = entry
+                self._spawn(self._handle_transfer(identity, transfer_number, dept_name))
             else:
-                asyncio.create_task(self.say("I'm sorry, please choose one of the options I mentioned earlier."))
+                self._spawn(self._say_prebuilt(REJECT_PROMPT))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """
+        Start a task from an event handler, eagerly where supported, keeping a reference to it until it
+        finishes so it isn't garbage collected part way through.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            asyncio.Task: The started task.
+        """
+        if _eager_task_factory is not None:
+            task = _eager_task_factory(asyncio.get_running_loop(), coro)
+        else:
+            task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
 
 
     async def _handle_transfer(self, identity: str, transfer_number: str, department: str) -> None:
@@ -136,8 +464,9 @@ class PhoneAssistant:
             transfer_number (str): The number to transfer to
             department (str): The name of the department
         """
-        await self.say(f"Transferring you to our {department} department in a moment. Please hold.")
-        await asyncio.sleep(6)
+        # Send the transfer as soon as the hold prompt starts playing, so the RPC round trip overlaps the
+        # prompt instead of being added after it.
+        await self._say_until_playing(TRANSFER_PROMPTS[department], timeout=TRANSFER_PROMPT_START_TIMEOUT)
         await self.transfer_call(identity, transfer_number)
 
 
@@ -150,33 +479,19 @@ class PhoneAssistant:
         """
 
         # Initialize the OpenAI model with updated instructions
-        self.model = openai.realtime.RealtimeModel(
-            instructions=(
-                "You are a friendly assistant providing support. "
-                "Please inform users they can:\n"
-                "- Press 1 for Billing\n"
-                "- Press 2 for Technical Support\n"
-                "- Press 3 for Customer Service"
-            ),
-            # We use Audio for voice, and text to feed the model context behind the scenes.
-            # Whenever we use text, it's important to make sure the model knows it's supposed 
-            # to respond with voice. We do this with prompt engineering throughout the agent.
-            modalities=["audio", "text"],
-            voice="sage"
-        )
+        self.model = build_realtime_model()
 
         # Create and start the multimodal agent
         self.assistant = MultimodalAgent(model=self.model)
         self.assistant.start(self.context.room, participant)
+        # start() opens the realtime session synchronously, so we can hold on to it from here on
+        self._session = self.model.sessions[0]
+        # Only the caller's speech counts as activity, so our own prompts can't keep an abandoned call alive
+        for event in ("input_speech_started", "input_speech_committed"):
+            self._session.on(event, self.touch)
 
-        # Greeting with menu options. This is the first thing the assistant says to the user.
-        # You don't need to have a greeting, but it's a good idea to have one if calls are incoming.
-        greeting = (
-            "Hi, thanks for calling Vandelay Industries — global leader in fine latex goods!"
-            "You can press 1 for Billing, 2 for Technical Support, "
-            "or 3 for Customer Service. You can also just talk to me, since I'm a LiveKit agent."
-        )
-        asyncio.create_task(self.say(greeting))
+        # Queue the greeting on the session right away; it's sent as soon as the realtime WebSocket connects.
+        self._spawn(self._say_prebuilt(GREETING_PROMPT))
 
     async def transfer_call(self, participant_identity: str, transfer_to: str) -> None:
         """
@@ -187,37 +502,32 @@ class PhoneAssistant:
             participant_identity (str): The identity of the participant.
             transfer_to (str): The phone number to transfer the call to.
         """
-        logger.info(f"Transferring call for participant {participant_identity} to {transfer_to}")
+        logger.info("Transferring call for participant %s to %s", participant_identity, transfer_to)
 
         try:
-            # Initialize LiveKit API client if not already done
-            if not self.livekit_api:
-                livekit_url = os.getenv('LIVEKIT_URL')
-                api_key = os.getenv('LIVEKIT_API_KEY')
-                api_secret = os.getenv('LIVEKIT_API_SECRET')
-                logger.debug(f"Initializing LiveKit API client with URL: {livekit_url}")
-                self.livekit_api = api.LiveKitAPI(
-                    url=livekit_url,
-                    api_key=api_key,
-                    api_secret=api_secret
-                )
-
             # Create transfer request
             transfer_request = proto_sip.TransferSIPParticipantRequest(
                 participant_identity=participant_identity,
                 room_name=self.context.room.name,
                 transfer_to=transfer_to,
-                play_dialtone=True
+                play_dialtone=True,
+                ringing_timeout={"seconds": TRANSFER_RINGING_TIMEOUT}
             )
-            logger.debug(f"Transfer request: {transfer_request}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Transfer request: %s", transfer_request)
 
-            # Perform transfer
-            await self.livekit_api.sip.transfer_sip_participant(transfer_request)
-            logger.info(f"Successfully transferred participant {participant_identity} to {transfer_to}")
+            # Perform transfer on the call's already-connected API client
+            await asyncio.wait_for(
+                self.livekit_api.sip.transfer_sip_participant(transfer_request), timeout=TRANSFER_RPC_TIMEOUT
+            )
+            logger.info("Successfully transferred participant %s to %s", participant_identity, transfer_to)
 
-        except Exception as e:
-            logger.error(f"Failed to transfer call: {e}", exc_info=True)
-            await self.say("I'm sorry, I couldn't transfer your call. Is there something else I can help with?")
+        except Exception:
+            logger.exception("Failed to transfer call")
+            # Stop anything still playing (usually the hold prompt) so the apology doesn't talk over it
+            if self._session is not None:
+                self._session.cancel_response()
+            await self._say_prebuilt(APOLOGY_PROMPT)
 
     async def cleanup(self) -> None:
         """
@@ -226,6 +536,15 @@ class PhoneAssistant:
         if self.livekit_api:
             await self.livekit_api.aclose()
             self.livekit_api = None
+        # LiveKitAPI.aclose() leaves a session it was given open, so we close ours ourselves
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
+        self._session = None
+        # Closing the model closes the call's realtime session and its WebSocket
+        if self.model:
+            await self.model.aclose()
+            self.model = None
 
 
 async def entrypoint(context: JobContext) -> None:
@@ -235,7 +554,12 @@ async def entrypoint(context: JobContext) -> None:
     Args:
         context (JobContext): The context for the job.
     """
+    if _eager_task_factory is None:
+        logger.info("Eager task factory unavailable (needs Python 3.12+), tasks will start on the next loop iteration")
+
     assistant = PhoneAssistant(context)
+    # Open the LiveKit API connection while we wait for the caller, rather than when they ask for a transfer
+    assistant.open_livekit_api()
     disconnect_event = asyncio.Event()
 
     @context.room.on("disconnected")
@@ -245,11 +569,32 @@ async def entrypoint(context: JobContext) -> None:
     try:
         participant = await assistant.connect_to_room()
         assistant.start_agent(participant)
-        # Wait until the room is disconnected
-        await disconnect_event.wait()
+        # The call lasts until the room disconnects, the realtime session dies, or the call goes idle,
+        # whichever comes first. Leaving the task group cancels the remaining watchers.
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(end_call_when(disconnect_event.wait(), "room disconnected"))
+                tg.create_task(end_call_when(assistant.wait_for_model_failure(), "realtime session closed"))
+                tg.create_task(end_call_when(assistant.wait_for_idle(IDLE_TIMEOUT), "call idle"))
+        except* CallEnded as group:
+            reason = str(group.exceptions[0])
+            logger.info("Call ended: %s", reason)
+            if not disconnect_event.is_set():
+                context.shutdown(reason=reason)
     finally:
         await assistant.cleanup()
 
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    # Each call runs in its own job process, so one bad session can't take down the others. The worker keeps
+    # some of them started and waiting; only override how many when NUM_IDLE_PROCESSES is set, so the SDK's
+    # own default (3 in production, 0 in dev mode) applies otherwise.
+    worker_options = {}
+    if CFG.num_idle_processes is not None:
+        worker_options["num_idle_processes"] = CFG.num_idle_processes
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint,
+            **worker_options
+        )
+    )
\ No newline at end of file